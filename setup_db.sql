@@ -52,3 +52,23 @@ create policy "Users insert own recordings"
 -- 5. Storage Bucket Setup (You might need to do this in UI)
 -- Create a bucket named 'audio_recordings'.
 -- Policy: SELECT for Authenticated. INSERT for Authenticated.
+
+-- 6. Recording Previews (waveform / spectrogram pyramids, kept out of recordings
+--    so "select *" on recordings and dataset exports stay small)
+create table public.recording_previews (
+  recording_id uuid primary key references public.recordings on delete cascade,
+  preview jsonb not null,
+  created_at timestamptz default now()
+);
+
+alter table public.recording_previews enable row level security;
+
+-- The subquery runs under the recordings policies, so a preview is visible
+-- exactly when its recording is (including any "doctors view all" policy).
+create policy "Previews visible with their recording"
+  on recording_previews for select
+  using ( exists (select 1 from recordings r where r.id = recording_id) );
+
+create policy "Users insert previews of own recordings"
+  on recording_previews for insert
+  with check ( exists (select 1 from recordings r where r.id = recording_id and r.user_id = auth.uid()) );
@@ -1,6 +1,7 @@
 import numpy as np
 import librosa
 from scipy.signal import medfilt
+from audio_processing.previews import build_previews
 
 def extract_features(audio_path):
     """
@@ -14,6 +15,9 @@ def extract_features(audio_path):
         # using pYIN to estimate fundamental frequency
         f0, voiced_flag, voiced_probs = librosa.pyin(y, fmin=librosa.note_to_hz('C2'), fmax=librosa.note_to_hz('C7'))
         
+        # Keep the per-frame track (NaN = unvoiced) for the previews
+        f0_track = f0
+
         # Filter out unvoiced parts (where f0 is NaN)
         f0 = f0[~np.isnan(f0)]
         
@@ -63,7 +67,10 @@ def extract_features(audio_path):
             "jitter_local": float(jitter),
             "shimmer_local": float(shimmer),
             "hnr_approx": float(hnr),
-            "duration": len(y) / sr
+            "duration": len(y) / sr,
+            # Zoomable waveform / spectrogram / pitch previews (see previews.py).
+            # Callers store this in recording_previews, not with the features.
+            "preview": build_previews(y, sr, f0_track)
         }
 
     except Exception as e:
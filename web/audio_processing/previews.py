@@ -0,0 +1,208 @@
+import base64
+import numpy as np
+import librosa
+
+# Compact, zoomable previews of a recording, built once at extraction time.
+# Everything is uint8-quantized, cut into fixed-width tiles and base64-encoded.
+# Each pyramid goes from full detail down to a single tile, and a render only
+# decodes the tiles of one level that overlap the visible window.
+
+WAVEFORM_BLOCK = 256          # samples per column in the finest waveform level
+WAVEFORM_TILE_WIDTH = 1024    # 1024 columns x (min, max) = 2 KB per tile
+MEL_BANDS = 32
+MEL_TILE_WIDTH = 128          # 32 x 128 bytes = 4 KB per tile
+MEL_DB_RANGE = 80.0
+PITCH_TILE_WIDTH = 1024       # 1 KB per tile
+FMIN = librosa.note_to_hz('C2')
+FMAX = librosa.note_to_hz('C7')
+
+
+def _encode(array):
+    return base64.b64encode(np.ascontiguousarray(array, dtype=np.uint8).tobytes()).decode('ascii')
+
+
+def _decode(text, shape=None):
+    array = np.frombuffer(base64.b64decode(text), dtype=np.uint8)
+    return array.reshape(shape) if shape is not None else array
+
+
+def _halve(values, reduce):
+    """Combines neighbouring columns along the last axis (odd tail repeated)"""
+    if values.shape[-1] % 2:
+        values = np.concatenate([values, values[..., -1:]], axis=-1)
+    return reduce(values[..., 0::2], values[..., 1::2])
+
+
+def _waveform_pyramid(y):
+    """
+    Min/max envelope at WAVEFORM_BLOCK samples per column, halved level by
+    level until one tile covers the whole clip.
+    """
+    block = WAVEFORM_BLOCK
+    n_cols = max(1, int(np.ceil(len(y) / block)))
+    frames = np.pad(y, (0, n_cols * block - len(y))).reshape(n_cols, block)
+    env = np.stack([frames.min(axis=1), frames.max(axis=1)])
+
+    levels = []
+    while True:
+        q = np.clip(np.round((env.T + 1.0) * 127.5), 0, 255)
+        tiles = [_encode(q[i:i + WAVEFORM_TILE_WIDTH]) for i in range(0, len(q), WAVEFORM_TILE_WIDTH)]
+        levels.append({"block": block, "columns": len(q), "tiles": tiles})
+        if len(q) <= WAVEFORM_TILE_WIDTH:
+            break
+        env = np.stack([_halve(env[0], np.minimum), _halve(env[1], np.maximum)])
+        block *= 2
+    return levels
+
+
+def _mel_pyramid(y, sr, hop_length):
+    """
+    Log-mel spectrogram on the same hop as the pitch track, then averaged
+    down in time per level until one tile covers the whole clip.
+    """
+    mel = librosa.feature.melspectrogram(y=y, sr=sr, hop_length=hop_length, n_mels=MEL_BANDS)
+    level = librosa.power_to_db(mel, ref=np.max, top_db=MEL_DB_RANGE)
+    hop = hop_length
+
+    levels = []
+    while True:
+        q = np.clip(np.round((level + MEL_DB_RANGE) / MEL_DB_RANGE * 255), 0, 255)
+        tiles = [_encode(q[:, i:i + MEL_TILE_WIDTH]) for i in range(0, q.shape[1], MEL_TILE_WIDTH)]
+        levels.append({"hop": hop, "columns": q.shape[1], "tiles": tiles})
+        if q.shape[1] <= MEL_TILE_WIDTH:
+            break
+        level = _halve(level, lambda a, b: (a + b) / 2)
+        hop *= 2
+    return levels
+
+
+def _mean_voiced(a, b):
+    """Average of two F0 values, ignoring an unvoiced (NaN) side"""
+    return np.where(np.isnan(a), b, np.where(np.isnan(b), a, (a + b) / 2))
+
+
+def _pitch_pyramid(f0, hop_length):
+    """
+    Per-frame F0 (NaN = unvoiced) as uint8 on a log scale: 0 is unvoiced,
+    1..255 spans FMIN..FMAX. Starts at the native pYIN hop and halves per
+    level until one tile covers the whole clip.
+    """
+    level = np.asarray(f0, dtype=np.float64)
+    hop = hop_length
+
+    levels = []
+    while True:
+        q = np.zeros(len(level))
+        voiced = ~np.isnan(level)
+        pos = np.log(level[voiced] / FMIN) / np.log(FMAX / FMIN)
+        q[voiced] = np.clip(np.round(1 + pos * 254), 1, 255)
+        tiles = [_encode(q[i:i + PITCH_TILE_WIDTH]) for i in range(0, len(q), PITCH_TILE_WIDTH)]
+        levels.append({"hop": hop, "columns": len(q), "tiles": tiles})
+        if len(q) <= PITCH_TILE_WIDTH:
+            break
+        level = _halve(level, _mean_voiced)
+        hop *= 2
+    return levels
+
+
+def build_previews(y, sr, f0, hop_length=512):
+    """
+    Builds waveform, spectrogram and pitch previews from the signal and the
+    per-frame pYIN output already computed by extract_features().
+    """
+    return {
+        "sr": sr,
+        "n_samples": len(y),
+        "waveform": _waveform_pyramid(y),
+        "spectrogram": {"n_mels": MEL_BANDS, "db_range": MEL_DB_RANGE,
+                        "levels": _mel_pyramid(y, sr, hop_length)},
+        "pitch": {"levels": _pitch_pyramid(f0, hop_length)}
+    }
+
+
+def _pick_level(levels, span_samples, width, step_key):
+    """
+    Coarsest level that still has `width` columns over the span; when even
+    the finest level has fewer, the finest one (levels[0]) is used.
+    """
+    for level in reversed(levels):
+        if span_samples / level[step_key] >= width:
+            return level
+    return levels[0]
+
+
+def _decode_range(level, first, last, tile_width, tile_shape):
+    """
+    Decodes only the tiles covering columns [first, last) of a level.
+    Returns the decoded tiles (shaped by tile_shape(cols)) and the offset
+    of column `first` within them.
+    """
+    first_tile, last_tile = first // tile_width, (last - 1) // tile_width
+    parts = []
+    for t in range(first_tile, last_tile + 1):
+        cols = min(tile_width, level["columns"] - t * tile_width)
+        parts.append(_decode(level["tiles"][t], tile_shape(cols)))
+    return parts, first - first_tile * tile_width
+
+
+def _column_range(level, start_s, end_s, sr, step_key):
+    first = max(0, int(start_s * sr // level[step_key]))
+    last = min(level["columns"], int(np.ceil(end_s * sr / level[step_key])))
+    return first, last
+
+
+def waveform_view(preview, start_s=0.0, end_s=None, width=800):
+    """
+    Returns (times, mins, maxs) in seconds / [-1, 1] for a time window.
+    """
+    sr = preview["sr"]
+    end_s = preview["n_samples"] / sr if end_s is None else end_s
+    level = _pick_level(preview["waveform"], (end_s - start_s) * sr, width, "block")
+    first, last = _column_range(level, start_s, end_s, sr, "block")
+    if last <= first:
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+
+    parts, offset = _decode_range(level, first, last, WAVEFORM_TILE_WIDTH, lambda cols: (cols, 2))
+    q = np.concatenate(parts)[offset:offset + last - first].astype(np.float32) / 127.5 - 1.0
+    times = (np.arange(first, last) + 0.5) * level["block"] / sr
+    return times, q[:, 0], q[:, 1]
+
+
+def spectrogram_view(preview, start_s=0.0, end_s=None, width=800):
+    """
+    Returns (times, log_mel_db) for a time window. log_mel_db has shape
+    (n_mels, columns).
+    """
+    sr = preview["sr"]
+    spec = preview["spectrogram"]
+    end_s = preview["n_samples"] / sr if end_s is None else end_s
+    level = _pick_level(spec["levels"], (end_s - start_s) * sr, width, "hop")
+    first, last = _column_range(level, start_s, end_s, sr, "hop")
+    if last <= first:
+        return np.zeros(0), np.zeros((spec["n_mels"], 0))
+
+    parts, offset = _decode_range(level, first, last, MEL_TILE_WIDTH, lambda cols: (spec["n_mels"], cols))
+    block = np.concatenate(parts, axis=1)[:, offset:offset + last - first]
+    db = block.astype(np.float32) / 255 * spec["db_range"] - spec["db_range"]
+    times = np.arange(first, last) * level["hop"] / sr
+    return times, db
+
+
+def pitch_view(preview, start_s=0.0, end_s=None, width=800):
+    """
+    Returns (times, f0_hz) for a time window, with NaN where unvoiced.
+    """
+    sr = preview["sr"]
+    end_s = preview["n_samples"] / sr if end_s is None else end_s
+    level = _pick_level(preview["pitch"]["levels"], (end_s - start_s) * sr, width, "hop")
+    first, last = _column_range(level, start_s, end_s, sr, "hop")
+    if last <= first:
+        return np.zeros(0), np.zeros(0)
+
+    parts, offset = _decode_range(level, first, last, PITCH_TILE_WIDTH, lambda cols: (cols,))
+    q = np.concatenate(parts)[offset:offset + last - first].astype(np.float32)
+    f0 = np.full(len(q), np.nan)
+    voiced = q > 0
+    f0[voiced] = FMIN * (FMAX / FMIN) ** ((q[voiced] - 1) / 254)
+    times = np.arange(first, last) * level["hop"] / sr
+    return times, f0
@@ -0,0 +1,205 @@
+import numpy as np
+import librosa
+
+# Same pitch search range as the batch extractor in features.py
+FMIN = librosa.note_to_hz('C2')
+FMAX = librosa.note_to_hz('C7')
+
+# Frames quieter than this (linear RMS, ~ -50 dBFS) never count as voiced
+SILENCE_RMS = 10 ** (-50 / 20)
+CLIP_LEVEL = 0.999
+
+# Stored with every streamed result. YIN pitch and fixed-frame RMS shimmer are
+# not numerically comparable with the batch pYIN / pitch-synchronous values,
+# so rows must be told apart before pooling them.
+METHOD = "streaming_yin"
+
+SAMPLE_FORMATS = ("pcm_s16le", "f32le")
+
+
+def decode_pcm(payload, sample_format="pcm_s16le"):
+    """
+    Converts a raw audio chunk (bytes) into float samples in [-1, 1].
+    Supported formats: 'pcm_s16le' (16-bit ints) and 'f32le' (32-bit floats).
+    """
+    if sample_format == "pcm_s16le":
+        return np.frombuffer(payload, dtype='<i2').astype(np.float32) / 32768.0
+    if sample_format == "f32le":
+        return np.frombuffer(payload, dtype='<f4').astype(np.float32)
+    raise ValueError(f"Unsupported sample format: {sample_format}")
+
+
+class StreamingFeatureExtractor:
+    """
+    Incremental version of extract_features() for audio that arrives in chunks.
+
+    Every pushed chunk is framed, analyzed once (YIN pitch + RMS level) and
+    folded into running sums. finalize() builds the feature dict from those
+    sums, so stopping a recording never re-analyzes the whole clip.
+
+    Shimmer here uses fixed frames rather than the batch extractor's
+    pitch-synchronous hop (which needs the final mean F0), so results carry
+    "method": "streaming_yin".
+    """
+    def __init__(self, sr=16000):
+        self.sr = sr
+        # Window must hold a few periods of FMIN for YIN to find it
+        self.frame_length = int(2 ** np.ceil(np.log2(4 * sr / FMIN)))
+        self.hop_length = self.frame_length // 4
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self.n_samples = 0
+        self.n_clipped = 0
+        self.peak = 0.0
+
+        # Frame counters
+        self.n_frames = 0
+        self.n_voiced = 0
+
+        # Running F0 statistics (Welford) over voiced frames
+        self.f0_mean = 0.0
+        self.f0_m2 = 0.0
+        self.last_f0 = None
+        self.f0_abs_diff_sum = 0.0
+        self.n_f0_diffs = 0
+
+        # Running amplitude statistics over all frames
+        self.rms_sum = 0.0
+        self.last_rms = None
+        self.rms_abs_diff_sum = 0.0
+        self.n_rms_diffs = 0
+
+    def push(self, chunk):
+        """
+        Adds a chunk of float samples and returns a live snapshot of the stats.
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        self.n_samples += len(chunk)
+        if len(chunk):
+            abs_chunk = np.abs(chunk)
+            self.n_clipped += int(np.count_nonzero(abs_chunk >= CLIP_LEVEL))
+            self.peak = max(self.peak, float(abs_chunk.max()))
+
+        self._buffer = np.concatenate([self._buffer, chunk])
+        chunk_pitch = None
+        chunk_rms = None
+
+        if len(self._buffer) >= self.frame_length:
+            n_frames = 1 + (len(self._buffer) - self.frame_length) // self.hop_length
+            span = (n_frames - 1) * self.hop_length + self.frame_length
+            chunk_pitch, chunk_rms = self._analyze(self._buffer[:span])
+            # Keep the overlap so the next frame starts exactly one hop later
+            self._buffer = self._buffer[n_frames * self.hop_length:]
+
+        return self.snapshot(chunk_pitch, chunk_rms)
+
+    def _analyze(self, y):
+        """
+        Runs YIN and RMS on whole frames of y and folds them into the running state.
+        Returns the last voiced pitch and the mean RMS of these frames.
+        """
+        f0 = librosa.yin(y, fmin=FMIN, fmax=FMAX, sr=self.sr,
+                         frame_length=self.frame_length, hop_length=self.hop_length, center=False)
+        rms = librosa.feature.rms(y=y, frame_length=self.frame_length,
+                                  hop_length=self.hop_length, center=False)[0]
+
+        # YIN always returns a value; treat silent frames and band-edge
+        # estimates (no periodicity found) as unvoiced.
+        voiced = (rms > SILENCE_RMS) & (f0 > FMIN * 1.05) & (f0 < FMAX * 0.95)
+
+        last_pitch = None
+        for value, amp, is_voiced in zip(f0, rms, voiced):
+            self.n_frames += 1
+            amp = float(amp)
+            self.rms_sum += amp
+            if self.last_rms is not None:
+                self.rms_abs_diff_sum += abs(amp - self.last_rms)
+                self.n_rms_diffs += 1
+            self.last_rms = amp
+
+            if not is_voiced:
+                continue
+            value = float(value)
+            self.n_voiced += 1
+            delta = value - self.f0_mean
+            self.f0_mean += delta / self.n_voiced
+            self.f0_m2 += delta * (value - self.f0_mean)
+            # Like the batch extractor, consecutive voiced frames are
+            # compared even across unvoiced gaps.
+            if self.last_f0 is not None:
+                self.f0_abs_diff_sum += abs(value - self.last_f0)
+                self.n_f0_diffs += 1
+            self.last_f0 = value
+            last_pitch = value
+
+        return last_pitch, float(np.mean(rms))
+
+    def _jitter(self):
+        if self.n_f0_diffs == 0 or self.f0_mean <= 0:
+            return 0.0
+        return (self.f0_abs_diff_sum / self.n_f0_diffs) / self.f0_mean
+
+    def _shimmer(self):
+        if self.n_rms_diffs == 0 or self.rms_sum <= 0:
+            return 0.0
+        return (self.rms_abs_diff_sum / self.n_rms_diffs) / (self.rms_sum / self.n_frames)
+
+    def snapshot(self, pitch=None, rms=None):
+        """
+        Current live statistics (cheap, no analysis).
+        """
+        return {
+            "status": "streaming",
+            "duration": self.n_samples / self.sr,
+            "pitch_hz": pitch,
+            "level_dbfs": float(20 * np.log10(rms + 1e-10)) if rms is not None else None,
+            "peak_dbfs": float(20 * np.log10(self.peak + 1e-10)),
+            "clipping_ratio": self.n_clipped / self.n_samples if self.n_samples else 0.0,
+            "voiced_ratio": self.n_voiced / self.n_frames if self.n_frames else 0.0,
+            "mean_f0": self.f0_mean if self.n_voiced else None,
+            "jitter_local": self._jitter()
+        }
+
+    def finalize(self):
+        """
+        Flushes the trailing partial frame and returns the scalar features of
+        extract_features() (no preview), tagged with the streaming method.
+        """
+        try:
+            # After a push the buffer holds the overlap with the last analyzed
+            # frame plus fewer than hop_length new samples; zero-pad those
+            # into one final frame.
+            overlap = self.frame_length - self.hop_length if self.n_frames else 0
+            if len(self._buffer) > overlap:
+                tail = np.pad(self._buffer, (0, self.frame_length - len(self._buffer)))
+                self._analyze(tail)
+            self._buffer = np.zeros(0, dtype=np.float32)
+
+            if self.n_voiced == 0:
+                return {
+                    "status": "failed",
+                    "reason": "No voice detected"
+                }
+
+            mean_f0 = self.f0_mean
+            std_f0 = np.sqrt(self.f0_m2 / self.n_voiced)
+            hnr = 20 * np.log10(mean_f0 / (std_f0 + 1e-6)) # Same rough heuristic as batch
+
+            return {
+                "status": "success",
+                "method": METHOD,
+                "mean_f0": float(mean_f0),
+                "std_f0": float(std_f0),
+                "jitter_local": float(self._jitter()),
+                "shimmer_local": float(self._shimmer()),
+                "hnr_approx": float(hnr),
+                "duration": self.n_samples / self.sr,
+                "voiced_ratio": self.n_voiced / self.n_frames,
+                "clipping_ratio": self.n_clipped / self.n_samples
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error_msg": str(e)
+            }
@@ -1,4 +1,5 @@
 from audio_processing.features import extract_features
+from audio_processing.streaming import StreamingFeatureExtractor
 
 class ComprehensiveSpeechAnalyzer:
     """
@@ -15,3 +16,10 @@ class ComprehensiveSpeechAnalyzer:
         print(f"Analyzing: {audio_path}")
         results = extract_features(audio_path)
         return results
+
+    def start_stream(self, sr=16000):
+        """
+        Starts an incremental analysis session for audio arriving in chunks.
+        Push chunks with .push() and call .finalize() when recording stops.
+        """
+        return StreamingFeatureExtractor(sr=sr)
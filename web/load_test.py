@@ -0,0 +1,380 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from audio_processing.previews import build_previews, waveform_view, spectrogram_view, pitch_view
+from records import flatten_recordings, filter_recordings
+from supabase_stub import StubState, start_stub_process
+
+# Load test: simulated clinicians running the doctor workflow
+# (login -> filter explorer -> open a record's preview -> submit recording
+# -> export) against the in-memory Supabase stand-in, which runs in its own
+# process, or against a Supabase project given with --target.
+#
+#   python load_test.py --users 20 --duration 60
+#   python load_test.py --rate 5 --users 50 --stub-latency-ms 40 --json report.json
+#   SUPABASE_KEY=... python load_test.py --target https://<project>.supabase.co --email ... --password ...
+
+OPERATIONS = ["login", "filter", "preview", "submit", "export", "session"]
+PD_STATUSES = ["Yes (Diagnosed PD)", "No (Healthy Control)", "Unknown"]
+LANGUAGES = ["English", "Hindi", "Marathi", "Tamil", "Other"]
+
+
+def describe_error(e):
+    """Exception type plus the first line of its message"""
+    lines = str(e).splitlines()
+    return f"{type(e).__name__}: {lines[0]}" if lines else type(e).__name__
+
+
+class Recorder:
+    """Thread-safe collection of (operation, latency, ok) samples"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(list)
+
+    def add(self, op, latency_s, ok, error=None):
+        with self.lock:
+            self.samples[op].append((latency_s, ok))
+            if error:
+                self.errors[op].append(error)
+
+    def timed(self, op, fn, *args):
+        """Runs fn, records its latency, and re-raises failures to abort the session"""
+        started = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            self.add(op, time.perf_counter() - started, False, describe_error(e))
+            raise
+        self.add(op, time.perf_counter() - started, True)
+        return result
+
+
+class Client:
+    """Minimal REST client speaking the same endpoints supabase-py uses"""
+    def __init__(self, base_url, api_key, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.token = None
+
+    def _request(self, method, path, body=None):
+        headers = {
+            "Content-Type": "application/json",
+            "apikey": self.api_key,
+            "Authorization": f"Bearer {self.token or self.api_key}",
+            "Prefer": "return=representation"
+        }
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read() or b"null")
+
+    def login(self, email, password):
+        response = self._request("POST", "/auth/v1/token?grant_type=password",
+                                 {"email": email, "password": password})
+        self.token = response["access_token"]
+        return response["user"]
+
+    def fetch_recordings(self):
+        return self._request("GET", "/rest/v1/recordings?select=*")
+
+    def insert_recording(self, row):
+        return self._request("POST", "/rest/v1/recordings", row)
+
+    def fetch_preview(self, recording_id):
+        rows = self._request("GET", f"/rest/v1/recording_previews?select=preview&recording_id=eq.{recording_id}&limit=1")
+        return rows[0]["preview"] if rows else None
+
+    def insert_preview(self, recording_id, preview):
+        return self._request("POST", "/rest/v1/recording_previews",
+                             {"recording_id": recording_id, "preview": preview})
+
+
+def synthetic_take(seconds):
+    """A vowel-like test signal: harmonic tone with vibrato and a little noise"""
+    sr = 16000
+    t = np.arange(int(sr * seconds)) / sr
+    f0 = random.uniform(90, 250) * (1 + 0.01 * np.sin(2 * np.pi * 5 * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = 0.3 * np.sin(phase) + 0.1 * np.sin(2 * phase) + 0.01 * np.random.randn(len(t))
+    return y.astype(np.float32), sr, f0
+
+
+def sample_preview(seconds):
+    """
+    A real build_previews() payload for a clip of the given length, so
+    preview uploads and reads have production-sized bodies.
+    """
+    y, sr, f0 = synthetic_take(seconds)
+    return build_previews(y, sr, f0[::512])
+
+
+def synthetic_features(args):
+    """Feature dict for a fake take; with --extract runs the real pipeline"""
+    if not args.extract:
+        return {
+            "status": "success",
+            "mean_f0": random.uniform(90, 250),
+            "std_f0": random.uniform(2, 30),
+            "jitter_local": random.uniform(0.002, 0.02),
+            "shimmer_local": random.uniform(0.02, 0.2),
+            "hnr_approx": random.uniform(10, 35),
+            "duration": args.clip_seconds,
+            "preview": args.preview
+        }
+
+    from scipy.io import wavfile
+    from audio_processing.features import extract_features
+
+    y, sr, _ = synthetic_take(args.clip_seconds)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
+        tmp_path = tmp.name
+    wavfile.write(tmp_path, sr, y)
+    try:
+        return extract_features(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def synthetic_row(user_id, args):
+    """Returns (recordings row, preview) the way components.py splits them"""
+    metadata = {
+        "age": random.randint(40, 85),
+        "gender": random.choice(["Male", "Female"]),
+        "language": random.choice(LANGUAGES),
+        "pd_status": random.choice(PD_STATUSES),
+        "notes": "load test",
+        "recorded_by_role": "doctor",
+        "recorder_id": user_id,
+        "subject_id": f"LT-{random.randint(0, 99999):05d}"
+    }
+    features = synthetic_features(args)
+    preview = features.pop("preview", None)
+    row = {
+        "user_id": user_id,
+        "audio_path": "not_stored",
+        "audio_url": "not_stored",
+        "metadata": metadata,
+        "features": features
+    }
+    return row, preview
+
+
+def filter_explorer(rows):
+    """
+    The doctor explorer's work: the shared flatten/filter from records.py
+    with a random choice of PD status and language filters.
+    """
+    if not rows:
+        return pd.DataFrame() # The view stops at "No recordings found."
+    df = flatten_recordings(rows)
+    return filter_recordings(df, df['recorded_by'].unique(),
+                             random.sample(PD_STATUSES, 2), random.sample(LANGUAGES, 3))
+
+
+def open_preview(client, filtered):
+    """Selecting a record in the explorer: fetch its preview and decode a full view"""
+    if filtered.empty:
+        return
+    preview = client.fetch_preview(filtered['id'].sample(1).iloc[0])
+    if preview:
+        waveform_view(preview)
+        spectrogram_view(preview)
+        pitch_view(preview)
+
+
+def submit(client, user_id, args):
+    """Recording row first, then its preview, as components.py saves them"""
+    row, preview = synthetic_row(user_id, args)
+    inserted = client.insert_recording(row)
+    if preview and inserted:
+        client.insert_preview(inserted[0]["id"], preview)
+
+
+def export_csv(rows):
+    """
+    Approximates the admin view's 'Download Full Dataset': the same row
+    count and JSON columns, without its few extra flattened metadata columns.
+    """
+    return pd.DataFrame(rows).to_csv(index=False).encode('utf-8')
+
+
+def run_session(args, recorder, worker_id, arrived_at=None):
+    """One clinician visit: login, browse, submit, export"""
+    arrived_at = arrived_at or time.perf_counter()
+    client = Client(args.target, args.api_key, args.timeout)
+    try:
+        email = args.email or f"doctor{worker_id}@loadtest.local"
+        user = recorder.timed("login", client.login, email, args.password)
+        filtered = recorder.timed("filter", lambda: filter_explorer(client.fetch_recordings()))
+        recorder.timed("preview", open_preview, client, filtered)
+        recorder.timed("submit", submit, client, user["id"], args)
+        recorder.timed("export", lambda: export_csv(client.fetch_recordings()))
+    except Exception as e:
+        recorder.add("session", time.perf_counter() - arrived_at, False, type(e).__name__)
+        return
+    recorder.add("session", time.perf_counter() - arrived_at, True)
+
+
+def run_closed_loop(args, recorder, deadline):
+    """--users clinicians each repeating sessions back to back"""
+    def worker(worker_id):
+        while time.perf_counter() < deadline:
+            run_session(args, recorder, worker_id)
+            if args.think_time:
+                time.sleep(random.expovariate(1.0 / args.think_time))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def run_open_loop(args, recorder, deadline):
+    """
+    Poisson arrivals at --rate sessions/s, served by at most --users at once.
+    Arrivals wait in a queue for a free clinician, and that wait counts in
+    the session latency. At the deadline, arrivals still queued are
+    cancelled rather than drained, so an overloaded run still ends on time.
+    Sessions already running finish. Returns the number cancelled.
+    """
+    pool = ThreadPoolExecutor(max_workers=args.users)
+    futures = []
+    i = 0
+    while True:
+        time.sleep(random.expovariate(args.rate))
+        if time.perf_counter() >= deadline:
+            break
+        futures.append(pool.submit(run_session, args, recorder, i % args.users, time.perf_counter()))
+        i += 1
+    pool.shutdown(wait=True, cancel_futures=True)
+    return sum(1 for f in futures if f.cancelled())
+
+
+def summarize(recorder, elapsed_s):
+    report = {}
+    for op in OPERATIONS:
+        samples = recorder.samples.get(op, [])
+        if not samples:
+            continue
+        latencies = np.array([s[0] for s in samples]) * 1000
+        errors = sum(1 for s in samples if not s[1])
+        p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
+        report[op] = {
+            "count": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples),
+            "throughput_per_s": (len(samples) - errors) / elapsed_s,
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(latencies.max())
+        }
+    return report
+
+
+def print_report(report, recorder):
+    header = f"{'operation':<10}{'count':>8}{'err%':>8}{'ops/s':>9}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    for op, r in report.items():
+        print(f"{op:<10}{r['count']:>8}{r['error_rate'] * 100:>7.1f}%{r['throughput_per_s']:>9.2f}"
+              f"{r['p50_ms']:>9.1f}{r['p90_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+    print("(latencies in ms)")
+
+    for op, errors in recorder.errors.items():
+        if op == "session":
+            continue
+        print(f"\n{op} errors ({len(errors)} total, showing up to 3):")
+        for e in errors[:3]:
+            print(f"   - {e}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulate concurrent clinicians against a Supabase stand-in.")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent clinicians (worker limit in --rate mode)")
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop session arrivals per second (queued ones are cancelled at the deadline)")
+    parser.add_argument("--duration", type=float, default=30, help="Test length in seconds")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between sessions (closed loop)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--extract", action="store_true", help="Run real feature extraction for each submit")
+    parser.add_argument("--clip-seconds", type=float, default=60, help="Length of synthetic takes (sets preview size)")
+    parser.add_argument("--target", default=None, help="Base URL of a Supabase project; default starts the stand-in")
+    parser.add_argument("--api-key", default=os.getenv("SUPABASE_KEY", "load-test"),
+                        help="anon key for --target (default: $SUPABASE_KEY)")
+    parser.add_argument("--email", default=None, help="Login email for --target (default doctorN@loadtest.local)")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--seed-recordings", type=int, default=200, help="Rows preloaded into the stand-in")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="Mean injected latency per stand-in request")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="Fraction of stand-in requests that fail")
+    parser.add_argument("--json", default=None, help="Also write the report to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Built once; every synthetic submit and seeded row shares it
+    args.preview = sample_preview(args.clip_seconds)
+
+    stub = None
+    if args.target is None:
+        state = StubState(latency_ms=args.stub_latency_ms, error_rate=args.stub_error_rate)
+        for i in range(args.users):
+            state.add_user(f"doctor{i}@loadtest.local", args.password)
+        seeded_at = datetime.now(timezone.utc).isoformat()
+        for i in range(args.seed_recordings):
+            row, preview = synthetic_row("seed", args)
+            row.update(id=f"seed-{i}", created_at=seeded_at)
+            state.tables["recordings"].append(row)
+            state.tables["recording_previews"].append({"recording_id": row["id"], "preview": preview})
+        stub, args.target = start_stub_process(state)
+        print(f"Started Supabase stand-in at {args.target}")
+    else:
+        print(f"WARNING: 'submit' inserts real rows into recordings and recording_previews on {args.target}.")
+        print("         Point --target at a scratch project, not production data.")
+
+    mode = f"open loop, {args.rate}/s arrivals" if args.rate else "closed loop"
+    print(f"Running {args.users} clinicians for {args.duration:.0f}s ({mode})...")
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    cancelled = 0
+    if args.rate:
+        cancelled = run_open_loop(args, recorder, deadline)
+    else:
+        run_closed_loop(args, recorder, deadline)
+    elapsed = time.perf_counter() - started
+
+    if stub:
+        stub.terminate()
+
+    report = summarize(recorder, elapsed)
+    print()
+    print_report(report, recorder)
+    if cancelled:
+        print(f"\n{cancelled} arrivals were still queued at the deadline and were cancelled "
+              f"(offered load exceeds what {args.users} clinicians can serve).")
+    if args.json:
+        with open(args.json, "w") as f:
+            config = {k: v for k, v in vars(args).items() if k not in ("api_key", "password", "preview")}
+            json.dump({"config": config, "elapsed_s": elapsed, "cancelled_arrivals": cancelled,
+                       "operations": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import json
+import pandas as pd
+
+# Dataset shaping shared by the doctor explorer and load_test.py.
+# Kept free of Streamlit so it can run outside the app.
+
+def flatten_recordings(data):
+    """
+    Flattens rows from the recordings table (metadata/features may be JSON
+    strings) into one DataFrame row per recording.
+    """
+    flat_data = []
+    for row in data:
+        item = {
+            'id': row.get('id'),
+            'created_at': row.get('created_at'),
+            'audio_url': row.get('audio_url')
+        }
+        
+        # Meta
+        meta = row.get('metadata', {})
+        if isinstance(meta, str):
+            try: meta = json.loads(meta)
+            except: meta = {}
+        
+        item.update({
+            'subject_id': meta.get('subject_id', 'anon'),
+            'age': meta.get('age'),
+            'gender': meta.get('gender'),
+            'language': meta.get('language'),
+            'pd_status': meta.get('pd_status'),
+            'recorded_by': meta.get('recorded_by_role', 'unknown'), # patient vs doctor
+            'notes': meta.get('notes')
+        })
+        
+        # Features (summary)
+        feats = row.get('features', {})
+        if isinstance(feats, str):
+            try: feats = json.loads(feats)
+            except: feats = {}
+            
+        item.update({
+            'jitter': feats.get('jitter_local', 0),
+            'shimmer': feats.get('shimmer_local', 0),
+            'full_features': feats
+        })
+        
+        flat_data.append(item)
+
+    df = pd.DataFrame(flat_data)
+    df['created_at'] = pd.to_datetime(df['created_at'])
+    return df
+
+def filter_recordings(df, recorded_by, pd_status, language):
+    """Applies the explorer's multiselect filters"""
+    return df[
+        (df['recorded_by'].isin(recorded_by)) &
+        (df['pd_status'].isin(pd_status)) & 
+        (df['language'].isin(language))
+    ]
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import time
+import numpy as np
+import websockets
+from audio_processing.streaming import StreamingFeatureExtractor, decode_pcm, SAMPLE_FORMATS
+
+# Live analysis server used while a subject is still recording.
+#
+# Protocol (one session per connection):
+#   client -> {"type": "start", "sample_rate": 16000, "format": "pcm_s16le"}
+#   client -> binary audio chunks (mono)
+#   server -> {"type": "update", "stats": {...}, "processing_ms": 3.2} per chunk
+#   client -> {"type": "stop"}
+#   server -> {"type": "final", "features": {...}}
+
+# There is no authentication, so only listen locally unless told otherwise
+HOST = os.getenv("STREAM_HOST", "127.0.0.1")
+PORT = int(os.getenv("STREAM_PORT", "8765"))
+LATENCY_BUDGET_MS = 100
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 48000
+
+
+def validate_start(control):
+    """Returns (sample_rate, sample_format), or raises ValueError for a bad 'start'"""
+    sample_rate = control.get("sample_rate", 16000)
+    if not isinstance(sample_rate, int) or not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+        raise ValueError(f"sample_rate must be an integer between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE}")
+    sample_format = control.get("format", "pcm_s16le")
+    if sample_format not in SAMPLE_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(SAMPLE_FORMATS)}")
+    return sample_rate, sample_format
+
+
+async def handle_session(websocket):
+    extractor = None
+    sample_format = "pcm_s16le"
+
+    async for message in websocket:
+        try:
+            if isinstance(message, bytes):
+                if extractor is None:
+                    await websocket.send(json.dumps({"type": "error", "error_msg": "Send 'start' before audio"}))
+                    continue
+
+                started = time.perf_counter()
+                stats = extractor.push(decode_pcm(message, sample_format))
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if elapsed_ms > LATENCY_BUDGET_MS:
+                    print(f"Chunk took {elapsed_ms:.1f} ms (budget {LATENCY_BUDGET_MS} ms)")
+
+                await websocket.send(json.dumps({
+                    "type": "update",
+                    "stats": stats,
+                    "processing_ms": elapsed_ms
+                }))
+                continue
+
+            control = json.loads(message)
+            if control.get("type") == "start":
+                extractor = None
+                sample_rate, sample_format = validate_start(control)
+                extractor = StreamingFeatureExtractor(sr=sample_rate)
+                await websocket.send(json.dumps({"type": "ready"}))
+            elif control.get("type") == "stop":
+                if extractor is None:
+                    await websocket.send(json.dumps({"type": "error", "error_msg": "No active session"}))
+                    continue
+                await websocket.send(json.dumps({"type": "final", "features": extractor.finalize()}))
+                extractor = None
+        except Exception as e:
+            await websocket.send(json.dumps({"type": "error", "error_msg": str(e)}))
+
+
+async def main():
+    # First librosa call compiles its kernels; pay that before clients connect
+    StreamingFeatureExtractor().push(np.zeros(16000, dtype=np.float32))
+    print(f"Streaming analysis listening on ws://{HOST}:{PORT}")
+    async with websockets.serve(handle_session, HOST, PORT):
+        await asyncio.Future() # Run forever
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,202 @@
+import argparse
+import json
+import multiprocessing
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# In-memory stand-in for the parts of Supabase the app talks to:
+#   POST /auth/v1/token?grant_type=password   (sign_in_with_password)
+#   GET  /rest/v1/<table>?select=*&col=eq.value
+#   POST /rest/v1/<table>                     (insert)
+# for the recordings and recording_previews tables.
+# Used by load_test.py; never point the real app at it with real data.
+
+TABLES = ("recordings", "recording_previews")
+
+
+class StubState:
+    """Users, sessions and table rows shared by all request threads"""
+    def __init__(self, latency_ms=0.0, error_rate=0.0):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.users = {}       # email -> user dict
+        self.sessions = {}    # access_token -> user id
+        self.tables = {name: [] for name in TABLES}
+
+    def __getstate__(self):
+        # Locks cannot be pickled; needed to hand the state to a child process
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def add_user(self, email, password, role="doctor"):
+        user = {
+            "id": str(uuid.uuid4()),
+            "email": email,
+            "password": password,
+            "user_metadata": {"role": role}
+        }
+        with self.lock:
+            self.users[email] = user
+        return user
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under a burst of
+    # clients, which would be measured as backend errors.
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state = None  # set by serve_stub()
+
+    def log_message(self, format, *args):
+        pass # Keep load test output readable
+
+    def _send(self, status, body):
+        payload = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _simulate_backend(self):
+        """Applies configured latency; returns False if this request should fail"""
+        if self.state.latency_ms:
+            time.sleep(random.expovariate(1.0 / self.state.latency_ms) / 1000)
+        if random.random() < self.state.error_rate:
+            self._send(503, {"message": "Injected failure"})
+            return False
+        return True
+
+    def _current_user_id(self):
+        token = self.headers.get("Authorization", "").replace("Bearer ", "")
+        return self.state.sessions.get(token)
+
+    def _table(self, path):
+        """Table name for /rest/v1/<table>, or None"""
+        prefix = "/rest/v1/"
+        name = path[len(prefix):] if path.startswith(prefix) else None
+        return name if name in self.state.tables else None
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if not self._simulate_backend():
+            return
+
+        if url.path == "/auth/v1/token":
+            creds = self._read_json()
+            user = self.state.users.get(creds.get("email"))
+            if not user or user["password"] != creds.get("password"):
+                self._send(400, {"error": "invalid_grant", "error_description": "Invalid login credentials"})
+                return
+            token = uuid.uuid4().hex
+            with self.state.lock:
+                self.state.sessions[token] = user["id"]
+            public_user = {k: v for k, v in user.items() if k != "password"}
+            self._send(200, {"access_token": token, "token_type": "bearer", "user": public_user})
+            return
+
+        table = self._table(url.path)
+        if not table:
+            self._send(404, {"message": f"No route for {url.path}"})
+            return
+        user_id = self._current_user_id()
+        if not user_id:
+            self._send(401, {"message": "JWT expired or missing"})
+            return
+        row = self._read_json()
+        if table == "recordings":
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("user_id", user_id)
+        row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        with self.state.lock:
+            self.state.tables[table].append(row)
+        self._send(201, [row])
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not self._simulate_backend():
+            return
+
+        table = self._table(url.path)
+        if not table:
+            self._send(404, {"message": f"No route for {url.path}"})
+            return
+        if not self._current_user_id():
+            self._send(401, {"message": "JWT expired or missing"})
+            return
+
+        # PostgREST style equality filters on top-level columns: ?col=eq.value
+        query = parse_qs(url.query)
+        filters = {k: v[0][3:] for k, v in query.items() if v[0].startswith("eq.")}
+        with self.state.lock:
+            rows = list(self.state.tables[table])
+        rows = [r for r in rows if all(str(r.get(k)) == v for k, v in filters.items())]
+        if "limit" in query:
+            rows = rows[:int(query["limit"][0])]
+        self._send(200, rows)
+
+
+def serve_stub(state, host="127.0.0.1", port=0, ready=None):
+    """
+    Serves the stand-in until the process is stopped. If `ready` is a queue,
+    the base URL is put on it once the socket is listening.
+    """
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = StubServer((host, port), handler)
+    base_url = f"http://{host}:{server.server_address[1]}"
+    if ready is not None:
+        ready.put(base_url)
+    server.serve_forever()
+
+
+def start_stub_process(state, host="127.0.0.1", port=0):
+    """
+    Runs the stand-in in its own process so it does not share the GIL with
+    the load generator. Returns (process, base_url); call process.terminate().
+    """
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    process = ctx.Process(target=serve_stub, args=(state, host, port, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=60)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the in-memory Supabase stand-in.")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--users", type=int, default=10, help="Creates doctor0..N-1@loadtest.local")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean injected latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    state = StubState(latency_ms=args.latency_ms, error_rate=args.error_rate)
+    for i in range(args.users):
+        state.add_user(f"doctor{i}@loadtest.local", args.password)
+    print(f"Supabase stand-in on http://127.0.0.1:{args.port} "
+          f"(doctor0..{args.users - 1}@loadtest.local / {args.password})")
+    try:
+        serve_stub(state, port=args.port)
+    except KeyboardInterrupt:
+        pass
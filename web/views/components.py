@@ -3,7 +3,7 @@ import os
 import tempfile
 import json
 from datetime import datetime
-from supabase_client import save_recording_data
+from supabase_client import save_recording_data, save_recording_preview
 from feature_extractor import ComprehensiveSpeechAnalyzer
 
 # Initialize analyzer
@@ -133,9 +133,21 @@ def render_recording_section(source_role="patient"):
                         "subject_id": participant_id
                     }
 
+                    # Previews are large; they go to their own table so dataset
+                    # queries and exports only carry the scalar features
+                    preview = features.pop('preview', None)
+
                     # Save using shared client
                     # For audio_url, we skip bucket for now as agreed
-                    save_recording_data(st.session_state.user.id, metadata, "not_stored", features)
+                    response = save_recording_data(st.session_state.user.id, metadata, "not_stored", features)
+
+                    # The recording is already stored at this point; a failed
+                    # preview must not look like a failed submission
+                    if preview and response and response.data:
+                        try:
+                            save_recording_preview(response.data[0]['id'], preview)
+                        except Exception as e:
+                            st.warning(f"Recording saved, but its waveform preview could not be stored: {e}")
                     
                     st.balloons()
                     st.success("✅ Data Successfully Contributed to Research Dataset!")
@@ -1,7 +1,9 @@
 import streamlit as st
-import pandas as pd
-import json
-from supabase_client import get_all_recordings
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from audio_processing.previews import waveform_view, spectrogram_view, pitch_view
+from supabase_client import get_all_recordings, get_recording_preview
+from records import flatten_recordings, filter_recordings
 from views.components import render_recording_section
 
 def render_doctor_view():
@@ -33,46 +35,7 @@ def render_data_explorer():
         return
 
     # 2. Process Data
-    flat_data = []
-    for row in data:
-        item = {
-            'id': row.get('id'),
-            'created_at': row.get('created_at'),
-            'audio_url': row.get('audio_url')
-        }
-        
-        # Meta
-        meta = row.get('metadata', {})
-        if isinstance(meta, str):
-            try: meta = json.loads(meta)
-            except: meta = {}
-        
-        item.update({
-            'subject_id': meta.get('subject_id', 'anon'),
-            'age': meta.get('age'),
-            'gender': meta.get('gender'),
-            'language': meta.get('language'),
-            'pd_status': meta.get('pd_status'),
-            'recorded_by': meta.get('recorded_by_role', 'unknown'), # patient vs doctor
-            'notes': meta.get('notes')
-        })
-        
-        # Features (summary)
-        feats = row.get('features', {})
-        if isinstance(feats, str):
-            try: feats = json.loads(feats)
-            except: feats = {}
-            
-        item.update({
-            'jitter': feats.get('jitter_local', 0),
-            'shimmer': feats.get('shimmer_local', 0),
-            'full_features': feats
-        })
-        
-        flat_data.append(item)
-
-    df = pd.DataFrame(flat_data)
-    df['created_at'] = pd.to_datetime(df['created_at'])
+    df = flatten_recordings(data)
 
     # 3. Filters
     with st.expander("🔍 Filters", expanded=True):
@@ -86,11 +49,7 @@ def render_data_explorer():
             lang_filter = st.multiselect("Language", options=df['language'].unique(), default=df['language'].unique())
 
     # Apply
-    filtered_df = df[
-        (df['recorded_by'].isin(rec_filter)) &
-        (df['pd_status'].isin(status_filter)) & 
-        (df['language'].isin(lang_filter))
-    ]
+    filtered_df = filter_recordings(df, rec_filter, status_filter, lang_filter)
 
     st.subheader(f"Clinical Dataset ({len(filtered_df)} records)")
     
@@ -113,3 +72,48 @@ def render_data_explorer():
         with c2:
             st.write("Acoustic Features:")
             st.json(row['full_features'])
+
+        # Fetched per selection so the explorer query stays small
+        try:
+            preview = load_recording_preview(row['id'])
+        except Exception as e:
+            st.warning(f"Could not load preview: {e}")
+            preview = None
+        if preview:
+            render_recording_preview(preview)
+        else:
+            st.caption("No waveform preview stored for this recording.")
+
+@st.cache_data(ttl=600, max_entries=20, show_spinner=False)
+def load_recording_preview(recording_id):
+    """Fetches a preview once per recording; slider moves rerun from the cache"""
+    return get_recording_preview(recording_id)
+
+def render_recording_preview(preview):
+    """Waveform, log-mel spectrogram and pitch contour from the stored pyramid"""
+    duration = preview['n_samples'] / preview['sr']
+    start_s, end_s = st.slider("View window (s)", 0.0, float(duration), (0.0, float(duration)), step=0.1)
+    if end_s <= start_s:
+        return
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.05,
+                        subplot_titles=("Waveform", "Spectrogram & Pitch"))
+
+    # Min/max envelope drawn as a filled band
+    times, mins, maxs = waveform_view(preview, start_s, end_s)
+    fig.add_trace(go.Scatter(x=times, y=maxs, line=dict(width=0.5, color='#3498db'), showlegend=False), row=1, col=1)
+    fig.add_trace(go.Scatter(x=times, y=mins, line=dict(width=0.5, color='#3498db'), fill='tonexty', showlegend=False), row=1, col=1)
+
+    spec_times, db = spectrogram_view(preview, start_s, end_s)
+    fig.add_trace(go.Heatmap(x=spec_times, z=db, colorscale='Viridis', showscale=False), row=2, col=1)
+
+    # Pitch on its own axis over the spectrogram
+    pitch_times, f0 = pitch_view(preview, start_s, end_s)
+    fig.add_trace(go.Scatter(x=pitch_times, y=f0, mode='lines', name='F0 (Hz)',
+                             line=dict(color='#e74c3c'), xaxis='x2', yaxis='y3'))
+    fig.update_layout(
+        height=500,
+        yaxis3=dict(overlaying='y2', side='right', title='F0 (Hz)', type='log'),
+        xaxis2_title="Time (s)"
+    )
+    st.plotly_chart(fig, use_container_width=True)